@@ -2,6 +2,9 @@ import pandas as pd
 import FinanceDataReader as fdr
 import numpy as np
 import os
+import sys
+import time
+import requests
 
 # ---------------------------------------------------------
 # 1. 설정
@@ -21,6 +24,177 @@ indices = {
 
 file_name = 'LifeAM_WRAP_TS.xlsx'
 
+# 장중 추정 기준가 (python Fund_NAV.py --live)
+LIVE_QUOTE_URL = 'https://polling.finance.naver.com/api/realtime/domestic/stock/'
+LIVE_BATCH_SIZE = 50      # 한 번에 조회할 종목 수
+LIVE_POLL_SECONDS = 5     # 조회 간격(초)
+LIVE_START_TIME = '09:00' # 정규장 시작 (한국 시간)
+LIVE_END_TIME = '15:40'   # 이 시각 이후 자동 종료 (한국 시간)
+
+
+# ---------------------------------------------------------
+# 1-1. 공통 전처리 (일괄 계산 / 라이브 모드 공용)
+# ---------------------------------------------------------
+def set_date_index(df):
+    """'기준가' 시트를 날짜 인덱스로 변환"""
+    df = df.copy()
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.set_index('Date')
+    else:
+        df.index = pd.to_datetime(df.iloc[:, 0])
+        df = df.iloc[:, 1:]
+    return df
+
+
+def load_weights(df_dict):
+    """비중 시트 정리 (코드 6자리, 날짜 변환)"""
+    target_sheet = 'NEW' if 'NEW' in df_dict.keys() else list(df_dict.keys())[0]
+    df_weights = df_dict[target_sheet].copy()
+
+    df_weights = df_weights.dropna(subset=['코드'])
+    df_weights['코드'] = df_weights['코드'].astype(str).str.strip()
+    df_weights = df_weights[df_weights['코드'].str.lower() != 'nan']
+    df_weights['코드'] = df_weights['코드'].str.zfill(6)
+    df_weights['날짜'] = pd.to_datetime(df_weights['날짜'])
+    return df_weights
+
+
+# ---------------------------------------------------------
+# 1-2. 장중 추정 기준가 (라이브 모드)
+# ---------------------------------------------------------
+def now_kst():
+    return pd.Timestamp.now(tz='Asia/Seoul').tz_localize(None)
+
+
+def fetch_live_changes(codes):
+    """보유 종목만 배치로 현재 등락률(%) 조회 → ({코드: 등락률}, 장 운영 여부)"""
+    changes = {}
+    market_open = True
+    for i in range(0, len(codes), LIVE_BATCH_SIZE):
+        batch = codes[i:i + LIVE_BATCH_SIZE]
+        try:
+            res = requests.get(LIVE_QUOTE_URL + ','.join(batch),
+                               headers={'User-Agent': 'Mozilla/5.0'}, timeout=5)
+            for item in res.json().get('datas', []):
+                # 장 종료 후에도 마지막 세션 등락률이 내려오므로 장 상태를 함께 확인
+                if item.get('marketStatus') and item['marketStatus'] != 'OPEN':
+                    market_open = False
+                try:
+                    changes[item['itemCode']] = float(str(item['fluctuationsRatio']).replace(',', ''))
+                except:
+                    pass
+        except Exception as e:
+            print(f"   ⚠️ 시세 조회 실패 ({len(batch)}종목): {e}")
+    return changes, market_open
+
+
+def run_live_nav():
+    """
+    전일 기준가 × (1 + 당일 추정 수익률)을 장중에 계속 갱신.
+    비중은 시작 시 한 번만 로드하고, 이후에는 등락률이 바뀐 종목의 기여분만 다시 계산한다.
+    """
+    print("🔴 장중 추정 기준가 모드 시작")
+
+    if not os.path.exists(file_name):
+        print(f"오류: '{file_name}' 파일이 없습니다.")
+        return
+
+    # 장 운영 시간이 아니면 등락률이 이미 기준가에 반영된 세션 값이라 중복 계산됨
+    now = now_kst()
+    now_hm = now.strftime('%H:%M')
+    if now.weekday() >= 5 or not (LIVE_START_TIME <= now_hm < LIVE_END_TIME):
+        print(f"오류: 장 운영 시간이 아닙니다. ({now.strftime('%Y-%m-%d %H:%M')} KST)")
+        return
+
+    today = now.normalize()
+    df_dict = pd.read_excel(file_name, sheet_name=None)
+
+    # 1) 전일 기준가
+    base_prices = dict(initial_base_prices)
+    base_date = pd.Timestamp(initial_start_date_str)
+    if '기준가' in df_dict and not df_dict['기준가'].empty:
+        df_base = set_date_index(df_dict['기준가'])
+        df_base = df_base[df_base.index < today]
+        if not df_base.empty:
+            for key in base_prices.keys():
+                if key in df_base.columns:
+                    base_prices[key] = df_base.iloc[-1][key]
+            base_date = df_base.index[-1]
+    print(f"   - 기준일: {base_date.strftime('%Y-%m-%d')}")
+
+    # 기준가가 전 영업일 것이 아니면 그 사이 수익률이 빠짐 (공휴일 다음 날은 --force)
+    prev_bday = today - pd.offsets.BDay(1)
+    if base_date < prev_bday and '--force' not in sys.argv:
+        print(f"오류: 기준가가 전 영업일({prev_bday.strftime('%Y-%m-%d')}) 기준이 아닙니다. "
+              f"먼저 일괄 계산(python Fund_NAV.py)을 실행하세요. (공휴일이면 --force)")
+        return
+
+    # 2) 오늘 유효한 비중 (전일까지 입력된 비중, 일괄 계산과 동일한 규칙)
+    df_weights = load_weights(df_dict)
+    df_weights = df_weights[df_weights['날짜'] < today]
+
+    pf_names = []
+    w_rows = []
+    for pf_name in base_prices.keys():
+        sub_df = df_weights[df_weights['상품명'] == pf_name]
+        if sub_df.empty: continue
+        w_table = sub_df.pivot(index='날짜', columns='코드', values='비중').ffill().fillna(0)
+        pf_names.append(pf_name)
+        w_rows.append(w_table.iloc[-1])
+
+    if not pf_names:
+        print("계산할 포트폴리오가 없습니다.")
+        return
+
+    # (포트폴리오 × 종목) 비중 행렬, 단위: %
+    w_matrix = pd.DataFrame(w_rows, index=pf_names).fillna(0)
+    w_matrix = w_matrix.loc[:, (w_matrix != 0).any(axis=0)]
+    codes = list(w_matrix.columns)
+    W = w_matrix.to_numpy(dtype=float)
+    base_vec = np.array([base_prices[name] for name in pf_names], dtype=float)
+    print(f"   - 포트폴리오 {len(pf_names)}개, 보유 종목 {len(codes)}개")
+
+    code_pos = {code: i for i, code in enumerate(codes)}
+    last_chg = np.zeros(len(codes))        # 종목별 마지막 등락률(%)
+    port_ret = np.zeros(len(pf_names))     # 포트폴리오별 누적 기여 합(%·%)
+    prev_nav = None
+
+    try:
+        while True:
+            changes, market_open = fetch_live_changes(codes)
+            if not market_open:
+                print("\n✅ 장 운영 중이 아니어서 종료합니다.")
+                break
+
+            # 등락률이 바뀐 종목만 기여분 차이를 반영
+            idx = [code_pos[c] for c, v in changes.items() if c in code_pos and v != last_chg[code_pos[c]]]
+            if idx:
+                new_chg = np.array([changes[codes[i]] for i in idx])
+                port_ret += W[:, idx] @ (new_chg - last_chg[idx])
+                last_chg[idx] = new_chg
+
+            # 비중(%) × 등락률(%) → /10000
+            nav = base_vec * (1 + port_ret / 10000)
+            if prev_nav is None or not np.allclose(nav, prev_nav):
+                now_str = now_kst().strftime('%H:%M:%S')
+                summary = ' | '.join(
+                    f"{name} {v:,.2f} ({r / 100:+.2f}%)" for name, v, r in zip(pf_names, nav, port_ret))
+                print(f"[{now_str}] {summary} (변동 {len(idx)}종목)")
+                prev_nav = nav
+
+            if now_kst().strftime('%H:%M') >= LIVE_END_TIME:
+                print("\n✅ 장 마감 시각이 지나 종료합니다.")
+                break
+            time.sleep(LIVE_POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n⏹ 라이브 모드 종료")
+
+
+if '--live' in sys.argv[1:]:
+    run_live_nav()
+    exit()
+
 # ---------------------------------------------------------
 # 2. 기존 데이터 확인 및 시작점 설정
 # ---------------------------------------------------------
@@ -43,15 +217,8 @@ if '기준가' in df_dict:
         is_update = False
     else:
         print("   - 기존 '기준가' 시트를 발견했습니다. 이어서 계산합니다.")
-        df_old = temp_df.copy()
-
         # 날짜 인덱스 설정
-        if 'Date' in df_old.columns:
-            df_old['Date'] = pd.to_datetime(df_old['Date'])
-            df_old = df_old.set_index('Date')
-        else:
-            df_old.index = pd.to_datetime(df_old.iloc[:, 0])
-            df_old = df_old.iloc[:, 1:]
+        df_old = set_date_index(temp_df)
 
         last_date = df_old.index[-1]
 
@@ -89,14 +256,7 @@ if start_date >= end_date:
 # ---------------------------------------------------------
 # 3. 비중 데이터 전처리
 # ---------------------------------------------------------
-target_sheet = 'NEW' if 'NEW' in df_dict.keys() else list(df_dict.keys())[0]
-df_weights = df_dict[target_sheet].copy()
-
-df_weights = df_weights.dropna(subset=['코드'])
-df_weights['코드'] = df_weights['코드'].astype(str).str.strip()
-df_weights = df_weights[df_weights['코드'].str.lower() != 'nan']
-df_weights['코드'] = df_weights['코드'].str.zfill(6)
-df_weights['날짜'] = pd.to_datetime(df_weights['날짜'])
+df_weights = load_weights(df_dict)
 
 # ---------------------------------------------------------
 # 4. 데이터 수집
@@ -0,0 +1,206 @@
+import pandas as pd
+import numpy as np
+import json
+import csv
+import sys
+import os
+from dataset_wide import load_wide_view
+
+# === 상수 정의 ===
+REPORT_FILE = 'dataset_anomalies.csv'
+STATE_FILE = 'dataset_analysis.json'  # 시리즈별 마지막으로 분석한 날짜
+
+# 구간은 모두 각 시리즈의 관측치 기준 (주간 SCFI는 20주, 일간 지표는 20일)
+ROLL_WINDOW = 20        # z-score 계산용 rolling 구간
+ROLL_MIN_PERIODS = 10   # 최소 관측치 수
+RET_HORIZON = 20        # 기간 수익률 구간
+Z_THRESHOLD = 5.0       # |z| 초과 시 JUMP
+Z_MIN_MOVE = 0.02       # z-score로 JUMP 판정할 최소 변동률 (평소 거의 안 움직이는 종목수 등 제외)
+LOOKBACK_OBS = 60       # 증분 분석 시 함께 읽을 과거 관측치 수
+
+# 데이터 타입별 1회 변동률 한도 (초과 시 JUMP)
+JUMP_LIMITS = {
+    'DRAM': 0.3,
+    'NAND': 0.3,
+    'OCEAN_FREIGHT': 0.25,
+    'CRYPTO': 0.25,
+    'COMMODITY': 0.2,
+    'INDEX': 0.5,
+    'INTEREST_RATE': 0.1,
+    'FX': 0.05,
+    'INDEX_KR': 0.15,
+    'INDEX_US': 0.08,
+}
+
+# 데이터 타입별 같은 값 연속 허용 횟수 (관측치 기준, 초과 시 STALE, None = 검사 안 함)
+# DRAM/NAND 가격은 몇 주씩 그대로인 경우가 많아 제외
+STALE_LIMITS = {
+    'DRAM': None,
+    'NAND': None,
+    'OCEAN_FREIGHT': 1,
+    'CRYPTO': 1,
+    'COMMODITY': 2,
+    'INDEX': 2,
+    'INTEREST_RATE': 2,
+    'FX': 2,
+    'INDEX_KR': 15,
+    'INDEX_US': 2,
+}
+
+
+def compute_stats(wide, types):
+    """
+    (날짜 × 제품명) 행렬을 시리즈별 관측치만 남긴 long 포맷으로 펼쳐 한 번에 계산.
+    직전 값, rolling, 연속 횟수 모두 각 시리즈의 관측치 기준이라 주간/일간 주기가 섞여 있어도
+    다른 시리즈의 날짜(주말 암호화폐 등) 때문에 끊기지 않는다.
+    """
+    s = wide.stack().dropna().astype(float)
+    s.index = s.index.set_names(['날짜', '제품명'])
+    s = s.swaplevel().sort_index()
+    g = s.groupby(level='제품명', sort=False)
+
+    prev = g.shift(1)
+    ret = s / prev - 1
+    g_ret = ret.groupby(level='제품명', sort=False)
+
+    # 현재 값은 제외하고 직전 구간의 평균/표준편차로 z-score 계산
+    roll = g_ret.rolling(ROLL_WINDOW, min_periods=ROLL_MIN_PERIODS)
+    mean = roll.mean().droplevel(0).groupby(level='제품명', sort=False).shift(1)
+    std = roll.std().droplevel(0).groupby(level='제품명', sort=False).shift(1)
+    z = ((ret - mean) / std).where(std > 0)
+
+    ret_n = s / g.shift(RET_HORIZON) - 1
+
+    # 같은 값 연속 횟수: 값이 바뀐 관측치마다 구간을 새로 시작
+    same = s == prev
+    block = (~same).groupby(level='제품명', sort=False).cumsum()
+    stale_run = same.astype(int).groupby([s.index.get_level_values('제품명'), block.to_numpy()]).cumsum()
+
+    # 한도는 시리즈(열) 단위로 한 번만 구한 뒤 관측치로 펼침 (타입 미지정/None = 검사 안 함)
+    names = s.index.get_level_values('제품명')
+    col_types = pd.Series(types, dtype=object).reindex(wide.columns)
+    jump_limit = col_types.map(JUMP_LIMITS).astype(float).fillna(np.inf).reindex(names).to_numpy()
+    stale_limit = col_types.map(STALE_LIMITS).astype(float).fillna(np.inf).reindex(names).to_numpy()
+
+    stats = pd.DataFrame({
+        '가격': s,
+        'ret': ret,
+        'ret_n': ret_n,
+        'z': z,
+        'stale_run': stale_run,
+    })
+    abs_ret = stats['ret'].abs().to_numpy()
+    z_jump = (stats['z'].abs() > Z_THRESHOLD).to_numpy() & (abs_ret > Z_MIN_MOVE)
+    stats['jump'] = (abs_ret > jump_limit) | z_jump
+    stats['stale'] = stats['stale_run'].to_numpy() > stale_limit
+    return stats
+
+
+def _load_state():
+    if os.path.exists(STATE_FILE):
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            pass
+    return {}
+
+
+def _save_report(rows):
+    """이상치 기록 (중복 체크 기준: 날짜, 제품명, 플래그)"""
+    existing_keys = set()
+    if os.path.exists(REPORT_FILE):
+        with open(REPORT_FILE, 'r', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) >= 7:
+                    existing_keys.add((row[0], row[1], row[6]))
+    else:
+        with open(REPORT_FILE, 'w', newline='', encoding='utf-8-sig') as f:
+            csv.writer(f).writerow(['날짜', '제품명', '데이터 타입', '가격', '변동률(%)', 'z-score', '플래그'])
+
+    new_rows = [row for row in rows if (row[0], row[1], row[6]) not in existing_keys]
+    if new_rows:
+        with open(REPORT_FILE, 'a', newline='', encoding='utf-8-sig') as f:
+            csv.writer(f).writerows(new_rows)
+    return len(new_rows)
+
+
+def run_analysis(full=False):
+    """시리즈별로 마지막 분석일 이후 추가된 관측치만 분석하고 요약 리포트 출력"""
+    print(f"\n{'=' * 60}")
+    print(f"🔎 데이터 점검 (수익률 / z-score / 급변·정체)")
+    print(f"{'=' * 60}")
+
+    wide = load_wide_view(ffill=False)
+    if wide.empty:
+        print("⚠️ 분석할 데이터가 없습니다.")
+        return None
+    types = wide.attrs.get('types', {})
+
+    # 시리즈마다 저장 시점이 달라(미국 지수는 전일 날짜로 저장 등) 마지막 분석일을 따로 관리
+    state = {} if full else _load_state()
+    last_dates = {k: pd.Timestamp(v) for k, v in state.get('last_dates', {}).items()}
+    default_last = pd.Timestamp(state['last_date']) if state.get('last_date') else pd.Timestamp.min
+
+    # (날짜 × 제품명) 행렬 위에서 열별 마지막 분석일과 비교
+    cutoff = pd.Series(last_dates, dtype='datetime64[ns]').reindex(wide.columns).fillna(default_last)
+    observed = wide.notna().to_numpy()
+    is_new = observed & (wide.index.to_numpy()[:, None] > cutoff.to_numpy()[None, :])
+    if not is_new.any():
+        print("💡 새로 추가된 데이터가 없습니다.")
+        return None
+
+    # rolling 계산에 필요한 시리즈별 과거 관측치만 함께 사용
+    obs_pos = np.cumsum(observed, axis=0)
+    first_new = np.where(is_new, obs_pos, np.iinfo(obs_pos.dtype).max).min(axis=0)
+    keep = observed & (obs_pos >= first_new - LOOKBACK_OBS)
+    cols = is_new.any(axis=0)
+    sub_wide = wide.where(keep).loc[keep[:, cols].any(axis=1), cols]
+
+    stats = compute_stats(sub_wide, types)
+    stat_cutoff = cutoff.reindex(stats.index.get_level_values(0)).to_numpy()
+    stats = stats[stats.index.get_level_values(1).to_numpy() > stat_cutoff]
+
+    rows = []
+    for flag in ['jump', 'stale']:
+        for (name, date), r in stats[stats[flag]].iterrows():
+            rows.append([
+                date.strftime('%Y-%m-%d'),
+                name,
+                types.get(name, ''),
+                r['가격'],
+                f"{r['ret'] * 100:.2f}",
+                f"{r['z']:.2f}",
+                flag.upper()
+            ])
+    rows.sort(key=lambda row: (row[0], row[6], row[1]))
+
+    # 요약 리포트
+    new_dates = stats.index.get_level_values(1)
+    latest = stats['ret_n'].dropna().groupby(level=0).last()
+    print(f"✓ 분석 기간: {new_dates.min().strftime('%Y-%m-%d')} ~ {new_dates.max().strftime('%Y-%m-%d')} "
+          f"({len(stats)}건 × {stats.index.get_level_values(0).nunique()}개 시리즈)")
+    print(f"✓ JUMP {sum(r[6] == 'JUMP' for r in rows)}건 / STALE {sum(r[6] == 'STALE' for r in rows)}건")
+    for row in rows[-10:]:
+        print(f"   ⚠️ [{row[6]}] {row[0]} {row[1]}: {row[3]} ({row[4]}%, z={row[5]})")
+    if not latest.empty:
+        movers = latest.reindex(latest.abs().sort_values(ascending=False).index[:5])
+        print(f"✓ 최근 {RET_HORIZON}회 변동 상위: " + ', '.join(f"{k} {v * 100:+.1f}%" for k, v in movers.items()))
+
+    if rows:
+        saved = _save_report(rows)
+        print(f"✅ 이상치 {saved}건 기록: {REPORT_FILE}")
+
+    for name, date in stats.index.to_frame(index=False).groupby('제품명')['날짜'].max().items():
+        last_dates[name] = date
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'last_dates': {k: v.strftime('%Y-%m-%d') for k, v in sorted(last_dates.items())}},
+                  f, ensure_ascii=False, indent=1)
+
+    return rows
+
+
+if __name__ == "__main__":
+    run_analysis(full='--full' in sys.argv)
@@ -0,0 +1,164 @@
+import pandas as pd
+import hashlib
+import os
+
+# === 상수 정의 ===
+CSV_FILE = 'dataset.csv'
+WIDE_FILE = 'dataset_wide.pkl'  # pickle: dtype/인덱스를 그대로 보존, 추가 의존성 없음
+
+# 데이터 타입별 forward-fill 한도 (최대 며칠까지 직전 값으로 채울지, None = 무제한)
+# 주간 SCFI는 다음 발표까지, 일간 지표는 주말/휴일 정도만 채움
+FFILL_LIMITS = {
+    'OCEAN_FREIGHT': 7,
+    'DRAM': 3,
+    'NAND': 3,
+    'FX': 3,
+    'COMMODITY': 3,
+    'INDEX': 3,
+    'INTEREST_RATE': 3,
+    'INDEX_KR': 3,
+    'INDEX_US': 3,
+    'CRYPTO': 0,
+}
+
+
+def _pivot(df_long):
+    """long 포맷(날짜, 제품명, 가격, 데이터 타입) → (날짜 × 제품명) wide 포맷"""
+    df_long = df_long.copy()
+    df_long['날짜'] = pd.to_datetime(df_long['날짜'])
+    df_long['가격'] = pd.to_numeric(df_long['가격'], errors='coerce')
+    df_long = df_long.dropna(subset=['가격'])
+
+    # 같은 (날짜, 제품명)이 여러 번 있으면 마지막 값 사용 (save_to_csv 이전 중복 데이터 대비)
+    df_long = df_long.drop_duplicates(subset=['날짜', '제품명'], keep='last')
+    wide = df_long.pivot(index='날짜', columns='제품명', values='가격').astype('float64')
+    wide.index.name = '날짜'
+    wide.columns.name = None
+
+    types = df_long.drop_duplicates(subset=['제품명'], keep='last').set_index('제품명')['데이터 타입']
+    return wide, types.to_dict()
+
+
+def _csv_fingerprint(size=None):
+    """dataset.csv 앞부분 size 바이트(기본: 전체)의 크기와 md5"""
+    if not os.path.exists(CSV_FILE):
+        return None
+    if size is None:
+        size = os.path.getsize(CSV_FILE)
+    md5 = hashlib.md5()
+    with open(CSV_FILE, 'rb') as f:
+        remaining = size
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            md5.update(chunk)
+            remaining -= len(chunk)
+    return {'size': size - remaining, 'md5': md5.hexdigest()}
+
+
+def _matches_csv(wide, appended_only=False):
+    """
+    wide view가 만들어진 시점의 dataset.csv와 지금 파일이 같은지 확인.
+    appended_only=True면 그 뒤에 행이 추가되기만 한 경우(save_to_csv)도 허용
+    """
+    fp = wide.attrs.get('csv_fingerprint')
+    if not fp:
+        return False
+    if not appended_only and os.path.getsize(CSV_FILE) != fp['size']:
+        return False
+    return _csv_fingerprint(fp['size']) == fp
+
+
+def _store(wide, types):
+    wide = wide.sort_index()
+    wide = wide.reindex(columns=sorted(wide.columns))
+    wide.attrs['types'] = types
+    wide.attrs['csv_fingerprint'] = _csv_fingerprint()
+    wide.to_pickle(WIDE_FILE)
+    return wide
+
+
+def rebuild_wide_view():
+    """dataset.csv 전체를 다시 읽어 wide view를 새로 생성"""
+    if not os.path.exists(CSV_FILE):
+        print(f"⚠️ {CSV_FILE} 파일이 없습니다.")
+        return None
+
+    df_long = pd.read_csv(CSV_FILE, encoding='utf-8-sig', dtype={'날짜': str, '제품명': str, '데이터 타입': str})
+    wide, types = _pivot(df_long)
+    print(f"✅ wide view 재생성 완료: {WIDE_FILE} ({wide.shape[0]}일 × {wide.shape[1]}개)")
+    return _store(wide, types)
+
+
+def update_wide_view(new_rows):
+    """save_to_csv가 추가한 행만 wide view에 반영 (파일이 없으면 전체 재생성)"""
+    if not os.path.exists(WIDE_FILE):
+        return rebuild_wide_view()
+
+    try:
+        wide = pd.read_pickle(WIDE_FILE)
+    except Exception as e:
+        print(f"⚠️ wide view 로드 실패, 재생성합니다: {e}")
+        return rebuild_wide_view()
+
+    # 추가 외에 CSV가 바뀌었으면(수동 수정, 중복 삭제, git revert 등) 증분 반영 불가
+    if not os.path.exists(CSV_FILE) or not _matches_csv(wide, appended_only=True):
+        print("💡 dataset.csv가 wide view와 달라 재생성합니다.")
+        return rebuild_wide_view()
+
+    if not new_rows:
+        return wide
+
+    df_new = pd.DataFrame([row[:4] for row in new_rows], columns=['날짜', '제품명', '가격', '데이터 타입'])
+    new_wide, new_types = _pivot(df_new)
+
+    types = dict(wide.attrs.get('types', {}))
+    types.update(new_types)
+
+    # 새 값이 기존 값보다 우선 (같은 칸이면 덮어쓰기)
+    wide = new_wide.combine_first(wide)
+    print(f"✅ wide view 갱신: {len(df_new)}건 반영")
+    return _store(wide, types)
+
+
+def load_wide_view(ffill=True):
+    """대시보드용 wide view 로드 (ffill=True면 데이터 타입별 FFILL_LIMITS 적용)"""
+    wide = None
+    if os.path.exists(WIDE_FILE):
+        try:
+            wide = pd.read_pickle(WIDE_FILE)
+        except Exception as e:
+            print(f"⚠️ wide view 로드 실패, 재생성합니다: {e}")
+    if wide is not None and os.path.exists(CSV_FILE) and not _matches_csv(wide):
+        print("💡 dataset.csv가 wide view와 달라 재생성합니다.")
+        wide = None
+    if wide is None:
+        wide = rebuild_wide_view()
+        if wide is None:
+            return pd.DataFrame()
+
+    if not ffill:
+        return wide
+
+    types = wide.attrs.get('types', {})
+    filled = wide.copy()
+
+    # 캘린더 기준으로 채우기 위해 날짜를 하루 단위로 확장한 뒤 원래 인덱스로 복원
+    full_idx = pd.date_range(wide.index.min(), wide.index.max(), freq='D')
+    daily = wide.reindex(full_idx)
+    for data_type in set(types.values()):
+        limit = FFILL_LIMITS.get(data_type, 0)
+        if limit == 0:
+            continue
+        cols = [c for c, t in types.items() if t == data_type and c in wide.columns]
+        if not cols:
+            continue
+        filled[cols] = daily[cols].ffill(limit=limit).reindex(wide.index)
+
+    filled.attrs['types'] = types
+    return filled
+
+
+if __name__ == "__main__":
+    rebuild_wide_view()
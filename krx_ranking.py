@@ -1,11 +1,23 @@
 import FinanceDataReader as fdr
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import csv
+import sys
 import os
 
 # 저장할 파일명
 CSV_FILE = 'krx_ranking.csv'
+TOP_K = 20
+
+# 분석 대상 설정 (시장명, 카테고리명, 정렬기준 컬럼)
+MARKETS = ['KOSPI', 'KOSDAQ']
+ANALYSIS_TYPES = [
+    ('Marcap', '시총상위'),
+    ('Amount', '거래대금상위'),
+    ('ChagesRatio', '상승률상위')
+]
 
 def setup_csv():
     """CSV 파일 초기 설정 (헤더 생성)"""
@@ -53,25 +65,17 @@ def main():
     target_date = datetime.now().strftime("%Y-%m-%d")
     all_final_data = []
 
-    # 분석 대상 설정 (시장명, 카테고리명, 정렬기준 컬럼)
-    markets = ['KOSPI', 'KOSDAQ']
-    analysis_types = [
-        ('Marcap', '시총상위'),
-        ('Amount', '거래대금상위'),
-        ('ChagesRatio', '상승률상위')
-    ]
-
-    for mkt in markets:
+    for mkt in MARKETS:
         # 해당 시장 데이터만 추출
         mkt_df = df[df['Market'] == mkt].copy()
         
-        for col, label in analysis_types:
+        for col, label in ANALYSIS_TYPES:
             category_full_name = f"{mkt}_{label}"
             print(f"📊 {category_full_name} 분석 중...")
             
             # 숫자형 변환 및 정렬
             mkt_df[col] = pd.to_numeric(mkt_df[col], errors='coerce').fillna(0)
-            top20 = mkt_df.sort_values(by=col, ascending=False).head(20)
+            top20 = mkt_df.sort_values(by=col, ascending=False).head(TOP_K)
             
             # 데이터 가공 및 리스트 추가
             for i, (_, row) in enumerate(top20.iterrows()):
@@ -102,5 +106,151 @@ def main():
         
         save_to_csv(all_final_data)
 
+# ---------------------------------------------------------
+# 과거 날짜 순위 재구성 (python krx_ranking.py --backfill 시작일 [종료일])
+# ---------------------------------------------------------
+def _fetch_history(code, start, end):
+    try:
+        d = fdr.DataReader(code, start, end)
+        if not d.empty:
+            return code, d[['Close', 'Volume', 'Change']]
+    except:
+        pass
+    return code, None
+
+def build_history_matrix(mkt_df, start, end, workers=8):
+    """
+    종목별 일봉을 한 번씩만 받아 (날짜 × 종목) 행렬 3개를 만든다.
+    - 시가총액: 종가 × 현재 상장주식수 (과거 주식수 변동은 반영되지 않음)
+    - 거래대금: 종가 × 거래량 (근사치)
+    - 등락률(%): Change × 100
+    """
+    codes = mkt_df['Code'].tolist()
+    closes, volumes, changes = {}, {}, {}
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for i, (code, d) in enumerate(ex.map(lambda c: _fetch_history(c, start, end), codes), 1):
+            if d is not None:
+                closes[code] = d['Close']
+                volumes[code] = d['Volume']
+                changes[code] = d['Change']
+            if i % 200 == 0:
+                print(f"   - {i}/{len(codes)} 종목 수집")
+
+    close = pd.DataFrame(closes).sort_index()
+    volume = pd.DataFrame(volumes).reindex(close.index)
+    change = pd.DataFrame(changes).reindex(close.index)
+
+    # 거래가 없는 날(거래량 0)은 순위 대상에서 제외
+    traded = volume > 0
+    shares = pd.to_numeric(mkt_df.set_index('Code')['Stocks'], errors='coerce').reindex(close.columns)
+
+    return {
+        'Marcap': (close * shares).where(traded),
+        'Amount': (close * volume).where(traded),
+        'ChagesRatio': (change * 100).where(traded),
+    }
+
+def rank_history(matrices, names, category_prefix, k=TOP_K):
+    """모든 날짜를 한 번에 top-K 정렬해 main()과 같은 형식의 행으로 변환"""
+    rows = []
+    m_cap = matrices['Marcap'].to_numpy(dtype=float)
+    amt = matrices['Amount'].to_numpy(dtype=float)
+    chg = matrices['ChagesRatio'].to_numpy(dtype=float)
+    dates = matrices['Marcap'].index.strftime('%Y-%m-%d')
+    name_arr = np.asarray(names, dtype=object)
+
+    for col, label in ANALYSIS_TYPES:
+        values = matrices[col].to_numpy(dtype=float)
+        if values.size == 0:
+            continue
+        n_valid = np.isfinite(values).sum(axis=1)
+        scores = np.where(np.isfinite(values), values, -np.inf)
+
+        kk = min(k, scores.shape[1])
+        # 행마다 상위 K개를 뽑은 뒤 그 K개만 내림차순 정렬
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+
+        category_full_name = f"{category_prefix}_{label}"
+        for r, date_str in enumerate(dates):
+            for i, j in enumerate(top[r, :min(kk, n_valid[r])]):
+                rows.append([
+                    date_str,
+                    category_full_name,
+                    i + 1,
+                    name_arr[j],
+                    f"{m_cap[r, j] / 100000000:,.0f}",
+                    f"{amt[r, j] / 100000000:,.0f}",
+                    f"{chg[r, j]:.2f}%"
+                ])
+    return rows
+
+def load_collected_days():
+    """이미 저장된 (날짜, 카테고리) 목록"""
+    collected = set()
+    if os.path.exists(CSV_FILE):
+        with open(CSV_FILE, 'r', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) >= 2:
+                    collected.add((row[0], row[1]))
+    return collected
+
+def backfill(start, end=None):
+    # 당일 장중 데이터가 main() 결과와 섞이지 않도록 기본 종료일은 어제
+    end = end or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    print(f"🚀 KRX 과거 순위 재구성 시작 ({start} ~ {end})")
+    setup_csv()
+
+    try:
+        df = fdr.StockListing('KRX')
+    except Exception as e:
+        print(f"❌ 데이터 로드 실패: {e}")
+        return
+
+    all_final_data = []
+    for mkt in MARKETS:
+        mkt_df = df[df['Market'] == mkt]
+        print(f"📊 {mkt} {len(mkt_df)}종목 일봉 수집 중...")
+        matrices = build_history_matrix(mkt_df, start, end)
+        if matrices['Marcap'].empty:
+            print(f"⚠️ {mkt} 데이터 없음")
+            continue
+
+        names = mkt_df.set_index('Code')['Name'].reindex(matrices['Marcap'].columns).astype(str)
+        rows = rank_history(matrices, names, mkt)
+        print(f"✓ {mkt}: {matrices['Marcap'].shape[0]}일, {len(rows)}건")
+        all_final_data.extend(rows)
+
+    # 이미 수집된 날짜·카테고리는 통째로 건너뜀 (데이터 출처가 달라 순위가 섞이지 않도록)
+    collected = load_collected_days()
+    skipped = {(row[0], row[1]) for row in all_final_data} & collected
+    all_final_data = [row for row in all_final_data if (row[0], row[1]) not in collected]
+    if skipped:
+        print(f"💡 이미 수집된 {len(skipped)}개 (날짜, 카테고리)는 제외")
+
+    if all_final_data:
+        # 날짜 순으로 저장
+        all_final_data.sort(key=lambda row: (row[0], row[1], row[2]))
+        save_to_csv(all_final_data)
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == '--backfill':
+        dates = sys.argv[2:]
+        try:
+            if not 1 <= len(dates) <= 2:
+                raise ValueError
+            for d in dates:
+                datetime.strptime(d, "%Y-%m-%d")
+        except ValueError:
+            print("사용법: python krx_ranking.py --backfill 시작일 [종료일]  (예: --backfill 2025-01-01 2025-12-31)")
+            sys.exit(1)
+        backfill(*dates)
+    elif len(sys.argv) > 1:
+        print("사용법: python krx_ranking.py [--backfill 시작일 [종료일]]")
+        sys.exit(1)
+    else:
+        main()
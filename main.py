@@ -14,6 +14,8 @@ import yfinance as yf
 import warnings
 import FinanceDataReader as fdr  # [변경] pykrx 대신 fdr 사용
 import pandas as pd
+from dataset_wide import update_wide_view, rebuild_wide_view, WIDE_FILE
+from dataset_analysis import run_analysis
 
 # 경고 메시지 무시
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -124,6 +126,20 @@ def save_to_csv(data):
                 writer = csv.writer(f)
                 writer.writerows(new_data)
             print(f"✅ {len(new_data)}건 저장 완료 (중복 제외됨)")
+
+            # wide view(날짜 × 제품명)에 새로 추가된 행만 반영
+            try:
+                update_wide_view(new_data)
+            except Exception as e:
+                # 증분 반영에 실패하면 CSV와 어긋나지 않도록 전체 재생성
+                print(f"⚠️ wide view 갱신 실패, 재생성합니다: {e}")
+                try:
+                    rebuild_wide_view()
+                except Exception as e2:
+                    print(f"⚠️ wide view 재생성 실패: {e2}")
+                    # 다음 로드 시 재생성되도록 오래된 파일 삭제
+                    if os.path.exists(WIDE_FILE):
+                        os.remove(WIDE_FILE)
             return True
         else:
             print("💡 새로운 데이터가 없습니다. (모두 중복)")
@@ -389,6 +405,12 @@ def main():
     crawl_krx_indices()  # FinanceDataReader 버전
     crawl_us_indices()
 
+    # 새로 추가된 날짜에 대한 이상치 점검
+    try:
+        run_analysis()
+    except Exception as e:
+        print(f"⚠️ 데이터 점검 실패: {e}")
+
     print(f"\n📁 결과 파일: {CSV_FILE}")
 
 